@@ -2,20 +2,25 @@
 import os
 import asyncio
 import aiohttp
-from pyrogram import Client, filters, idle
+from pyrogram import Client, StopPropagation, filters, idle
+from pyrogram.errors import MessageIdInvalid, MessageIdsEmpty
 from pyrogram.types import Message
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import time
+from datetime import datetime
 from dotenv import load_dotenv
 import logging
-from pyrogram import utils
+from pyrogram import raw, utils
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging (DETECTOR_LOG_LEVEL=INFO/DEBUG for troubleshooting)
 logging.basicConfig(
-    level=logging.WARNING,
+    level=os.getenv("DETECTOR_LOG_LEVEL", "WARNING").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -28,12 +33,23 @@ API_ID = os.getenv("TELEGRAM_API_ID")
 API_HASH = os.getenv("TELEGRAM_API_HASH")
 GROUP_ID = int(os.getenv("TELEGRAM_GROUP_ID", "0"))
 WEBHOOK_PORT = os.getenv("WEBHOOK_PORT", "15847")
-WEBHOOK_URL = f"http://localhost:{WEBHOOK_PORT}/api/deletion-webhook"
+# Loopback IP rather than "localhost" so webhook calls never hit the resolver
+WEBHOOK_URL = f"http://127.0.0.1:{WEBHOOK_PORT}/api/deletion-webhook"
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "relay_messages.db")
 
+# Raw (unprefixed) channel ID of the monitored supergroup, None for basic groups
+MONITORED_CHANNEL_ID = utils.get_channel_id(GROUP_ID) if str(GROUP_ID).startswith("-100") else None
+
 logger.info(f"Using database path: {DB_PATH}")
 logger.info(f"Monitoring group: {GROUP_ID}")
 
+# Use uvloop when available; must be installed before the client grabs a loop
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Initialize Pyrogram client
 session_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions")
 app = Client(
@@ -43,241 +59,418 @@ app = Client(
     workdir=session_path
 )
 
-# Initialize message cache with size limit
-message_cache = {}
+# Resolved InputPeer of the monitored group, cached in main()
+monitored_peer = None
+
+# Shared HTTP session for webhook calls, created in main() after client start
+http_session = None
+
+class CacheEntry:
+    """Cached state for a tracked bot message: only what periodic_check reads"""
+    __slots__ = ('chat_id', 'timestamp', 'mapping_missed')
+
+    def __init__(self, chat_id, timestamp):
+        self.chat_id = chat_id
+        self.timestamp = timestamp
+        # Set after one deletion lookup found no mapping; a second miss drops it
+        self.mapping_missed = False
+
+class DeletedMsg:
+    """Minimal stand-in for a deleted Message, for deletions found outside events"""
+    __slots__ = ('id',)
+
+    def __init__(self, id):
+        self.id = id
+
+# Initialize message cache with size limit. Insertion-ordered (oldest first),
+# so eviction is an O(1) popitem from the front instead of a full sweep.
+message_cache = OrderedDict()
 MAX_CACHE_SIZE = 200  # Limit cache to 200 messages to prevent memory issues
 CACHE_MAX_AGE = 600  # 10 minutes in seconds
+BOT_MSG_CHECK_AGE = 3  # Bot messages are polled once they are older than this (seconds)
+MAX_CHECKS_PER_TICK = 10  # Upper bound on messages polled per check
+SWEEP_INTERVAL = 60  # Fallback sweep interval; new messages get a scheduled check
 
-def cleanup_old_cache_entries():
-    """Remove old entries from message cache to prevent memory leaks"""
-    current_time = datetime.now()
-    entries_to_remove = []
-    
-    for msg_id, msg_data in message_cache.items():
-        age = (current_time - msg_data['timestamp']).total_seconds()
-        if age > CACHE_MAX_AGE:
-            entries_to_remove.append(msg_id)
-    
-    for msg_id in entries_to_remove:
-        del message_cache[msg_id]
-    
-    if entries_to_remove:
-        logger.info(f"Cleaned up {len(entries_to_remove)} old cache entries")
+# Pending scheduled check (asyncio TimerHandle) and references to running tasks
+scheduled_check = None
+background_tasks = set()
+
+# Deletion IDs already delivered to the main bot, used to drop duplicate
+# deletion reports; IDs are only added once their webhook has succeeded
+recent_deletions = OrderedDict()
+MAX_RECENT_DELETIONS = 1024
+
+# Deletion IDs currently being looked up / posted, so a concurrent duplicate
+# report (event and poll at the same moment) doesn't send a second webhook
+pending_deletions = set()
+
+# Long-lived read-only database connection, opened on first use. Queries run
+# in worker threads via asyncio.to_thread, so access is serialized by db_lock
+# (re-entrant, since lookups hold it while calling get_db()).
+db_conn = None
+db_lock = threading.RLock()
 
 def get_db():
-    """Get database connection with proper timeout and WAL mode for concurrent access"""
-    # Use URI with mode=ro to open read-only without blocking writers.
-    # NOTE: do NOT use immutable=1 here — it makes SQLite ignore the -wal file,
-    # so recently-relayed (un-checkpointed) mappings are invisible and freshly
-    # deleted messages return "No mapping found". mode=ro still reads the WAL.
-    uri = f"file:{DB_PATH}?mode=ro"
-    conn = sqlite3.connect(uri, timeout=30.0, uri=True)
-    conn.execute("PRAGMA busy_timeout=10000")
-    return conn
+    """Get the shared database connection, opening it on first use"""
+    global db_conn
+    with db_lock:
+        if db_conn is None:
+            # Use URI with mode=ro to open read-only without blocking writers.
+            # NOTE: do NOT use immutable=1 here — it makes SQLite ignore the -wal file,
+            # so recently-relayed (un-checkpointed) mappings are invisible and freshly
+            # deleted messages return "No mapping found". mode=ro still reads the WAL.
+            uri = f"file:{DB_PATH}?mode=ro"
+            conn = sqlite3.connect(uri, timeout=30.0, uri=True, check_same_thread=False)
+            # journal_mode=WAL and synchronous=NORMAL are set by the main bot,
+            # which owns writes; these are the per-connection reader settings
+            conn.execute("PRAGMA busy_timeout=10000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            db_conn = conn
+        return db_conn
+
+@lru_cache(maxsize=32)
+def mapping_lookup_sql(count):
+    """Build the mapping lookup for a batch of `count` message IDs.
+
+    One statement covers both sources the main bot writes: message_tracking
+    (filled as soon as the Telegram service sees the message) and
+    platform_messages (archived asynchronously). Reusing the identical SQL text
+    per batch size lets sqlite3's statement cache skip re-preparing it; both
+    halves are answered from covering indexes (idx_tracking_lookup and
+    idx_platform_messages_covering) without touching table rows.
+    """
+    placeholders = ",".join("?" * count)
+    return (
+        f"SELECT telegram_msg_id, mapping_id, 0 AS src FROM message_tracking "
+        f"WHERE telegram_msg_id IN ({placeholders}) AND mapping_id IS NOT NULL "
+        f"UNION ALL "
+        f"SELECT CAST(message_id AS INTEGER), mapping_id, 1 AS src FROM platform_messages "
+        f"WHERE platform = 'Telegram' AND message_id IN ({placeholders})"
+    )
+
+def lookup_mappings(msg_ids):
+    """Return {telegram_msg_id: mapping_id} for the given message IDs (blocking)"""
+    params = msg_ids + [str(msg_id) for msg_id in msg_ids]
+    mappings = {}
+    with db_lock:
+        rows = get_db().execute(mapping_lookup_sql(len(msg_ids)), params).fetchall()
+    # UNION ALL output order isn't guaranteed, so pick by source: a
+    # message_tracking row (src 0) always wins, platform_messages (src 1) only
+    # fills IDs message_tracking didn't resolve
+    for msg_id, mapping_id, src in rows:
+        if mapping_id and (src == 0 or int(msg_id) not in mappings):
+            mappings[int(msg_id)] = mapping_id
+    return mappings
 
 # Message handler - using decorator
-@app.on_message(filters.chat(GROUP_ID))
+# Only bot (relayed) messages are ever polled by periodic_check; deletions of
+# everything else arrive through the on_deleted_messages event, so other
+# messages are filtered out before the handler runs
+@app.on_message(filters.chat(GROUP_ID) & filters.bot)
 async def track_message(client: Client, message: Message):
-    """Track ALL messages in the group including bot messages"""
-    username = message.from_user.username if message.from_user else 'Unknown'
-    user_id = message.from_user.id if message.from_user else 'Unknown'
-    is_bot = message.from_user.is_bot if message.from_user else False
-    
-    logger.info(f"[TRACKING] Message {message.id} from @{username} (ID: {user_id}, Bot: {is_bot})")
-    logger.info(f"[TRACKING] Content: {(message.text or message.caption or '[Media]')[:50]}...")
-    
-    # Store ALL messages in cache, including bot messages
-    message_cache[message.id] = {
-        'chat_id': message.chat.id,
-        'timestamp': datetime.now(),
-        'username': username,
-        'user_id': user_id,
-        'content': (message.text or message.caption or '[Media]')[:50],
-        'is_bot': is_bot,  # Track if it's a bot message
-        'is_own': message.from_user and message.from_user.is_self
-    }
-    
-    logger.info(f"Cached message {message.id} (cache size: {len(message_cache)}, bot: {is_bot})")
-    
-    # Clean up old messages from cache if it's getting too large
+    """Track relayed (bot) messages in the group for deletion polling"""
+    # Lazy %-style arguments so nothing is formatted when INFO is disabled
+    logger.info("[TRACKING] Message %s from @%s (ID: %s, Bot: True)",
+                message.id, message.from_user.username, message.from_user.id)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[TRACKING] Content: %s...", (message.text or message.caption or '[Media]')[:50])
+    
+    # Store the relayed message in the cache
+    message_cache[message.id] = CacheEntry(message.chat.id, time.monotonic())
+    
+    message_cache.move_to_end(message.id)
+    
+    logger.info("Cached message %s (cache size: %s)", message.id, len(message_cache))
+    
+    # Drop the oldest entry once the cache is full
     if len(message_cache) > MAX_CACHE_SIZE:
-        cleanup_old_cache_entries()
+        message_cache.popitem(last=False)
+    
+    schedule_check()
 
 # Deletion handler - using decorator  
 @app.on_deleted_messages(filters.chat(GROUP_ID))
-async def handle_deleted_messages(client: Client, messages):
-    """Handle message deletion events"""
-    logger.info(f"=== DELETION DETECTED ===")
-    logger.info(f"Deleted {len(messages)} messages: {[msg.id for msg in messages]}")
-    logger.info(f"Detection method: {'Event' if client else 'Periodic Check'}")
+async def handle_deleted_messages(client: Client, messages, force=False):
+    """Handle message deletion events.
+
+    force skips the duplicate check (used by the manual /testdelete command).
+    """
+    # Skip IDs already delivered or in flight (e.g. reported by both the
+    # event and the poll)
+    msg_ids = [
+        msg.id for msg in messages
+        if force or (msg.id not in recent_deletions and msg.id not in pending_deletions)
+    ]
+    
+    if not msg_ids:
+        return
     
-    db = None
+    logger.info("=== DELETION DETECTED ===")
+    logger.info("Deleted %s messages: %s", len(msg_ids), msg_ids)
+    logger.info("Detection method: %s", 'Event' if client else 'Periodic Check')
+    
+    pending_deletions.update(msg_ids)
     try:
-        db = get_db()
-        cursor = db.cursor()
-
-        for msg in messages:
-            try:
-                msg_id = msg.id
-                logger.info(f"Processing deletion of message {msg_id}")
-
-                # Check if we have this message in cache
-                if msg_id in message_cache:
-                    logger.info(f"Message {msg_id} was in our cache")
-                    del message_cache[msg_id]
-
-                # Check database for mapping
-                cursor.execute(
-                    "SELECT mapping_id FROM platform_messages WHERE platform = 'Telegram' AND message_id = ?",
-                    (str(msg_id),)
-                )
-                result = cursor.fetchone()
-
-                if result and result[0]:
-                    mapping_id = result[0]
-                    logger.info(f"Found mapping {mapping_id} for deleted message {msg_id}")
-
-                    # Notify main bot via webhook
-                    async with aiohttp.ClientSession() as session:
-                        try:
-                            webhook_data = {
-                                "telegram_msg_id": msg_id,
-                                "mapping_id": mapping_id
-                            }
-                            logger.info(f"Sending webhook: {webhook_data}")
-                            async with session.post(WEBHOOK_URL, json=webhook_data) as resp:
-                                if resp.status == 200:
-                                    logger.info(f"Successfully notified main bot")
-                                else:
-                                    logger.error(f"Webhook failed: {resp.status}")
-                        except Exception as e:
-                            logger.error(f"Failed to notify main bot: {e}")
-                else:
-                    logger.warning(f"No mapping found for message {msg_id}")
-
-            except Exception as e:
-                logger.error(f"Error handling deleted message: {e}")
+        delivered, unmapped = await notify_deletions(msg_ids)
+    finally:
+        pending_deletions.difference_update(msg_ids)
+    
+    # A missing mapping may just not be written yet, so a cached message gets
+    # one more lookup on the next check; after that (or for uncached IDs,
+    # which are never polled) stop tracking it
+    for msg_id in unmapped:
+        entry = message_cache.get(msg_id)
+        if entry is not None and not entry.mapping_missed:
+            entry.mapping_missed = True
+            logger.info("No mapping found for message %s yet, will retry", msg_id)
+        else:
+            message_cache.pop(msg_id, None)
+            logger.warning("No mapping found for message %s", msg_id)
+    
+    # Only delivered deletions are final; failed ones stay eligible for a
+    # later report (and stay cached so the next sweep retries them)
+    for msg_id in delivered:
+        recent_deletions[msg_id] = None
+        recent_deletions.move_to_end(msg_id)
+        if message_cache.pop(msg_id, None) is not None:
+            logger.info("Message %s was in our cache", msg_id)
+    while len(recent_deletions) > MAX_RECENT_DELETIONS:
+        recent_deletions.popitem(last=False)
+
+async def notify_deletions(msg_ids):
+    """Look up mappings for msg_ids and post them to the main bot.
 
+    Returns (delivered, unmapped): the IDs whose deletion the main bot
+    accepted, and the IDs the database has no mapping for.
+    """
+    # Look up all mappings in a single query, off the event loop
+    try:
+        mappings = await asyncio.to_thread(lookup_mappings, msg_ids)
     except sqlite3.OperationalError as e:
-        logger.warning(f"Database locked in deletion handler, skipping: {e}")
-    finally:
-        if db:
-            db.close()
+        logger.warning(f"Database locked in deletion handler, will retry: {e}")
+        return [], []
+    
+    deletions = []
+    unmapped = []
+    for msg_id in msg_ids:
+        mapping_id = mappings.get(msg_id)
+        if mapping_id:
+            logger.info("Found mapping %s for deleted message %s", mapping_id, msg_id)
+            deletions.append({
+                "telegram_msg_id": msg_id,
+                "mapping_id": mapping_id
+            })
+        else:
+            unmapped.append(msg_id)
+    
+    if not deletions:
+        return [], unmapped
+    
+    # Notify main bot via a single webhook (reuses the shared keep-alive session)
+    try:
+        webhook_data = {"deletions": deletions}
+        logger.info("Sending webhook: %s", webhook_data)
+        async with http_session.post(WEBHOOK_URL, json=webhook_data) as resp:
+            if resp.status == 200:
+                logger.info("Successfully notified main bot of %s deletions", len(deletions))
+                return [d["telegram_msg_id"] for d in deletions], unmapped
+            logger.error(f"Webhook failed: {resp.status}")
+            # A failure partway through still reports what was published;
+            # count those as delivered so the retry doesn't publish them twice
+            body = await resp.json(content_type=None)
+            return [int(msg_id) for msg_id in body.get("published") or []], unmapped
+    except Exception as e:
+        logger.error(f"Failed to notify main bot: {e}")
+    return [], unmapped
+
+def write_heartbeat():
+    """Write the current time to the heartbeat file (blocking)"""
+    heartbeat_file = os.path.join(os.path.dirname(__file__), "heartbeat.txt")
+    with open(heartbeat_file, "w") as f:
+        f.write(f"{datetime.now().isoformat()}\n")
 
 async def update_heartbeat():
     """Update heartbeat file to show bot is alive"""
-    heartbeat_file = os.path.join(os.path.dirname(__file__), "heartbeat.txt")
     try:
-        with open(heartbeat_file, "w") as f:
-            f.write(f"{datetime.now().isoformat()}\n")
+        await asyncio.to_thread(write_heartbeat)
     except Exception as e:
         logger.warning(f"Failed to update heartbeat: {e}")
 
+async def fetch_alive_message_ids(msg_ids):
+    """Fetch msg_ids from the monitored group with a raw call using the cached peer.
+
+    Skips Pyrogram's per-call peer resolution and high-level Message parsing.
+    """
+    ids = [raw.types.InputMessageID(id=msg_id) for msg_id in msg_ids]
+    if isinstance(monitored_peer, raw.types.InputPeerChannel):
+        channel = raw.types.InputChannel(
+            channel_id=monitored_peer.channel_id,
+            access_hash=monitored_peer.access_hash
+        )
+        result = await app.invoke(raw.functions.channels.GetMessages(channel=channel, id=ids))
+    else:
+        result = await app.invoke(raw.functions.messages.GetMessages(id=ids))
+    return {msg.id for msg in result.messages if not isinstance(msg, raw.types.MessageEmpty)}
+
+async def find_deleted_messages(chat_id, msg_ids):
+    """Return the IDs in msg_ids that no longer exist, using one batched request"""
+    try:
+        if chat_id == GROUP_ID and monitored_peer is not None:
+            alive = await fetch_alive_message_ids(msg_ids)
+        else:
+            msgs = await app.get_messages(chat_id, msg_ids)
+            alive = {msg.id for msg in msgs if msg is not None and not msg.empty}
+    except (MessageIdInvalid, MessageIdsEmpty):
+        if len(msg_ids) == 1:
+            return msg_ids
+        # Rare: probe the IDs individually (concurrently) to find which are gone
+        results = await asyncio.gather(
+            *(find_deleted_messages(chat_id, [msg_id]) for msg_id in msg_ids)
+        )
+        return [msg_id for deleted in results for msg_id in deleted]
+    
+    return [msg_id for msg_id in msg_ids if msg_id not in alive]
+
+async def check_cached_messages():
+    """Poll recently cached bot messages and report any that were deleted"""
+    current_time = time.monotonic()
+    messages_to_check = []
+    
+    # Remove very old messages from the front of the cache
+    while message_cache:
+        oldest = next(iter(message_cache.values()))
+        if current_time - oldest.timestamp <= CACHE_MAX_AGE:
+            break
+        message_cache.popitem(last=False)
+    
+    # The cache only holds bot (relayed) messages; deletions of everything
+    # else are reported reliably by the on_deleted_messages event. Entries
+    # are ordered oldest-first, so stop at the first one too young to check.
+    for msg_id, entry in message_cache.items():
+        if current_time - entry.timestamp <= BOT_MSG_CHECK_AGE:
+            break
+        messages_to_check.append((msg_id, entry.chat_id))
+    
+    # Prefer the most recent messages, which are the likeliest to be deleted
+    messages_to_check = messages_to_check[-MAX_CHECKS_PER_TICK:]
+    
+    # Group by chat so each chat costs one get_messages call
+    ids_by_chat = {}
+    for msg_id, chat_id in messages_to_check:
+        ids_by_chat.setdefault(chat_id, []).append(msg_id)
+    
+    deleted_ids = []
+    for chat_id, msg_ids in ids_by_chat.items():
+        try:
+            deleted_ids.extend(await find_deleted_messages(chat_id, msg_ids))
+        except Exception as e:
+            logger.error(f"Error checking messages in chat {chat_id}: {e}")
+    
+    if deleted_ids:
+        logger.info("Messages %s were deleted (bot messages)", deleted_ids)
+        await handle_deleted_messages(None, [DeletedMsg(msg_id) for msg_id in deleted_ids])
+
+def start_background_task(coro):
+    """Start a task and keep a reference to it until it finishes"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def run_scheduled_check():
+    """Run the check scheduled by schedule_check()"""
+    global scheduled_check
+    scheduled_check = None
+    try:
+        await check_cached_messages()
+    except Exception as e:
+        logger.error(f"Error in scheduled check: {e}")
+    
+    # Messages that arrived after the timer started were still too young to
+    # poll; follow up once the newest of them is old enough
+    if message_cache and scheduled_check is None:
+        newest = next(reversed(message_cache.values()))
+        age = time.monotonic() - newest.timestamp
+        if age <= BOT_MSG_CHECK_AGE:
+            schedule_check(BOT_MSG_CHECK_AGE + 1 - age)
+
+def schedule_check(delay=BOT_MSG_CHECK_AGE + 1):
+    """Schedule one batched check shortly after a bot message is cached.
+
+    Messages arriving while a check is pending share it, so a burst of relayed
+    messages still costs a single get_messages call; any of them still too
+    young when it runs get a follow-up check.
+    """
+    global scheduled_check
+    if scheduled_check is None:
+        scheduled_check = asyncio.get_running_loop().call_later(
+            delay,
+            lambda: start_background_task(run_scheduled_check())
+        )
+
 async def periodic_check():
-    """Periodically check for deleted messages"""
+    """Periodically sweep the cache as a fallback for later deletions"""
     await asyncio.sleep(10)  # Initial delay
     check_count = 0
     
     while True:
-        await asyncio.sleep(15)  # Check more frequently (every 15 seconds instead of 30)
+        await asyncio.sleep(SWEEP_INTERVAL)
         check_count += 1
         
-        # Update heartbeat every 5 checks (every ~75 seconds)
-        if check_count % 5 == 0:
-            await update_heartbeat()
+        # Update heartbeat on every sweep (monitor_bot.sh allows 5 minutes)
+        await update_heartbeat()
         
         try:
             # Only log debug if we have many messages
             if len(message_cache) > 20:
-                logger.debug(f"[PERIODIC CHECK #{check_count}] Checking {len(message_cache)} cached messages")
-            
-            current_time = datetime.now()
-            messages_to_check = []
+                logger.debug("[PERIODIC CHECK #%s] Checking %s cached messages", check_count, len(message_cache))
             
-            # Check messages with different timing based on type
-            for msg_id, msg_data in list(message_cache.items()):
-                msg_age = (current_time - msg_data['timestamp']).total_seconds()
-                is_bot = msg_data.get('is_bot', False)
-                is_own = msg_data.get('is_own', False)
-                
-                # Check bot messages (relayed messages) more aggressively (after 3 seconds)
-                # Check own messages after 5 seconds
-                # Check other messages after 10 seconds
-                if is_bot:
-                    min_age = 3  # Bot messages checked very quickly
-                elif is_own:
-                    min_age = 5  # Own messages checked quickly
-                else:
-                    min_age = 10  # Other messages normal timing
-                
-                if msg_age > min_age and msg_age < CACHE_MAX_AGE:
-                    messages_to_check.append((msg_id, msg_data['chat_id'], is_bot))
-                elif msg_age > CACHE_MAX_AGE:
-                    # Remove very old messages from cache
-                    del message_cache[msg_id]
-            
-            # Only log if we have many messages to check
-            if messages_to_check and len(messages_to_check) > 20:
-                bot_msg_count = sum(1 for _, _, is_bot in messages_to_check if is_bot)
-                logger.debug(f"Checking {len(messages_to_check)} messages for deletion (including {bot_msg_count} bot messages)")
-            
-            for msg_id, chat_id, is_bot in messages_to_check[:50]:  # Limit to 50
-                try:
-                    # Get single message
-                    msg = await app.get_messages(chat_id, msg_id)
-                    
-                    # Check if message was deleted
-                    if msg is None or msg.empty:
-                        logger.info(f"Message {msg_id} was deleted (bot message: {is_bot})")
-                        # Create deleted message object
-                        class DeletedMsg:
-                            def __init__(self, id):
-                                self.id = id
-                        
-                        await handle_deleted_messages(None, [DeletedMsg(msg_id)])
-                        
-                except Exception as e:
-                    if "MESSAGE_ID_INVALID" in str(e):
-                        logger.info(f"Message {msg_id} was deleted (INVALID)")
-                        class DeletedMsg:
-                            def __init__(self, id):
-                                self.id = id
-                        await handle_deleted_messages(None, [DeletedMsg(msg_id)])
-                        
+            await check_cached_messages()
         except Exception as e:
             logger.error(f"Error in periodic check: {e}")
 
-@app.on_message(filters.private)
+# Manual deletion trigger for testing. Filtered down to the command itself so
+# ordinary private messages never invoke a Python callback.
+@app.on_message(filters.private & filters.command("testdelete"))
 async def handle_private(client: Client, message: Message):
-    """Handle private messages to avoid unhandled updates"""
-    logger.debug(f"Received private message from {message.from_user.first_name if message.from_user else 'Unknown'}")
-    
-    # Add test command for manual deletion trigger
-    if message.text and message.text.startswith("/testdelete "):
-        try:
-            msg_id = int(message.text.split()[1])
-            logger.info(f"Manual deletion test for message {msg_id}")
-            
-            # Create deleted message object
-            class DeletedMsg:
-                def __init__(self, id):
-                    self.id = id
-            
-            await handle_deleted_messages(None, [DeletedMsg(msg_id)])
-            await message.reply("Deletion event triggered")
-        except (ValueError, IndexError):
-            await message.reply("Usage: /testdelete <message_id>")
-
-# Catch-all handler for other groups to prevent unhandled updates
-@app.on_message(~filters.chat(GROUP_ID) & filters.group)
-async def handle_other_groups(client: Client, message: Message):
-    """Handle messages from other groups to avoid peer resolution errors"""
-    pass  # Silently ignore messages from other groups
-
-@app.on_deleted_messages(~filters.chat(GROUP_ID))
-async def handle_other_deletions(client: Client, messages):
-    """Handle deletions from other groups to avoid peer resolution errors"""
-    pass  # Silently ignore deletions from other groups
+    """Handle the /testdelete <message_id> command"""
+    try:
+        msg_id = int(message.command[1])
+        logger.info(f"Manual deletion test for message {msg_id}")
+        
+        await handle_deleted_messages(None, [DeletedMsg(msg_id)], force=True)
+        await message.reply("Deletion event triggered")
+    except (ValueError, IndexError):
+        await message.reply("Usage: /testdelete <message_id>")
+
+def raw_update_channel_id(update):
+    """Return the channel ID a raw update belongs to, or None if not a channel update"""
+    channel_id = getattr(update, "channel_id", None)
+    if channel_id is None:
+        peer = getattr(getattr(update, "message", None), "peer_id", None)
+        channel_id = getattr(peer, "channel_id", None)
+    return channel_id
+
+# Runs before all other handlers: stop dispatch for updates from other
+# channels/supergroups so their messages never reach the filter chain
+@app.on_raw_update(group=-1)
+async def drop_other_chats(client: Client, update, users, chats):
+    """Drop updates from channels and supergroups other than the monitored group"""
+    channel_id = raw_update_channel_id(update)
+    if channel_id is not None and channel_id != MONITORED_CHANNEL_ID:
+        raise StopPropagation
+
+def prepare_session_db():
+    """Switch the Pyrogram session database to WAL mode (persistent per file)"""
+    session_file = os.path.join(session_path, "deletion_detector.session")
+    if not os.path.exists(session_file):
+        return
+    conn = sqlite3.connect(session_file, timeout=5.0)
+    try:
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
 
 # Main function
 async def main():
@@ -287,96 +480,30 @@ async def main():
     logger.info(f"Webhook URL: {WEBHOOK_URL}")
     logger.info("="*60)
     
-    # Add a small delay to avoid startup conflicts with other SQLite databases
-    await asyncio.sleep(2)
+    # Put the session database in WAL mode with a busy timeout so a briefly
+    # held lock is waited out by SQLite instead of failing app.start()
+    try:
+        prepare_session_db()
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Could not prepare session database: {e}")
+    
+    await app.start()
+    logger.info("Successfully started Pyrogram client")
     
-    # Start the client with retry logic for database lock issues
-    max_retries = 10  # Increased from 3
-    retry_delay = 2
+    # One pooled HTTP session for all webhook calls instead of one per deletion
+    global http_session
+    http_session = aiohttp.ClientSession(
+        # Keep the localhost connection open between deletion bursts
+        connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=5)
+    )
     
-    for attempt in range(max_retries):
-        try:
-            # Clear any potential locks first
-            if attempt > 0:
-                # Try to force close any hanging database connections
-                try:
-                    import gc
-                    gc.collect()
-                    await asyncio.sleep(0.5)
-                except:
-                    pass
-            
-            await app.start()
-            logger.info("Successfully started Pyrogram client")
-            break
-        except (sqlite3.OperationalError, Exception) as e:
-            error_msg = str(e).lower()
-            if ("database is locked" in error_msg or "database lock" in error_msg) and attempt < max_retries - 1:
-                logger.warning(f"Database locked, retrying in {retry_delay} seconds... (attempt {attempt + 1}/{max_retries})")
-                
-                # After 5 attempts, try aggressive database cleanup
-                if attempt == 4:  # 5th attempt (0-indexed)
-                    logger.warning("Attempting aggressive database cleanup after 5 failed attempts...")
-                    try:
-                        import os
-                        import subprocess
-                        
-                        # Force kill any sqlite processes that might be locking the database
-                        try:
-                            subprocess.run(["pkill", "-f", "sqlite"], check=False, capture_output=True)
-                            logger.info("Killed any hanging sqlite processes")
-                        except:
-                            pass
-                        
-                        # Remove session files
-                        session_files = [
-                            "deletion_detector/deletion_bot.session",
-                            "deletion_detector/deletion_bot.session-journal",
-                            "deletion_detector/deletion_bot.session-wal",
-                            "deletion_detector/deletion_bot.session-shm"
-                        ]
-                        
-                        for session_file in session_files:
-                            if os.path.exists(session_file):
-                                try:
-                                    os.remove(session_file)
-                                    logger.info(f"Removed session file: {session_file}")
-                                except Exception as remove_err:
-                                    logger.warning(f"Could not remove {session_file}: {remove_err}")
-                        
-                        # Force garbage collection
-                        import gc
-                        gc.collect()
-                        
-                        # Wait a bit longer after cleanup
-                        await asyncio.sleep(5)
-                        logger.info("Database cleanup completed, continuing with retry...")
-                        
-                    except Exception as cleanup_err:
-                        logger.error(f"Database cleanup failed: {cleanup_err}")
-                
-                await asyncio.sleep(retry_delay)
-                retry_delay = min(retry_delay * 1.5, 30)  # Exponential backoff with cap
-            else:
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to start client after {max_retries} attempts. Forcing database cleanup...")
-                    # Last resort: try to remove the session file and recreate
-                    try:
-                        import os
-                        session_file = "deletion_detector/deletion_bot.session"
-                        if os.path.exists(session_file):
-                            logger.warning("Removing locked session file...")
-                            os.remove(session_file)
-                            # Try one more time with fresh session
-                            await asyncio.sleep(2)
-                            await app.start()
-                            logger.info("Successfully started with fresh session")
-                            break
-                    except Exception as cleanup_err:
-                        logger.error(f"Cleanup failed: {cleanup_err}")
-                        raise e
-                else:
-                    raise
+    # Open the shared database connection up front so the first deletion
+    # doesn't pay for it (get_db() retries lazily if this fails)
+    try:
+        await asyncio.to_thread(get_db)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not open database at startup: {e}")
     
     # Get session info
     me = await app.get_me()
@@ -393,14 +520,17 @@ async def main():
     # Pre-resolve only the monitored group's peer
     logger.info("Pre-resolving monitored group peer...")
     try:
-        # Only resolve the specific group we're monitoring
-        await app.resolve_peer(GROUP_ID)
-        logger.debug(f"Resolved monitored group peer: {GROUP_ID}")
+        # Only resolve the specific group we're monitoring, and keep the
+        # InputPeer so periodic checks can skip peer resolution entirely
+        global monitored_peer
+        monitored_peer = await app.resolve_peer(GROUP_ID)
+        logger.debug("Resolved monitored group peer: %s", GROUP_ID)
     except Exception as e:
-        logger.debug(f"Error pre-resolving monitored group peer: {e}")
+        logger.debug("Error pre-resolving monitored group peer: %s", e)
     
-    # Start periodic check
-    asyncio.create_task(periodic_check())
+    # Start periodic check (referenced from background_tasks so it isn't
+    # garbage-collected mid-run)
+    start_background_task(periodic_check())
     
     logger.info("Bot is running and monitoring for deletions...")
     logger.info("="*60)
@@ -408,7 +538,12 @@ async def main():
     # Keep running
     await idle()
     
-    # Cleanup
+    # Cleanup: drop any pending scheduled check before its session goes away
+    if scheduled_check is not None:
+        scheduled_check.cancel()
+    await http_session.close()
+    if db_conn:
+        db_conn.close()
     await app.stop()
 
 if __name__ == "__main__":
@@ -3,22 +3,36 @@
 Create a fixed version of the bot that ignores problematic peers
 """
 
-import shutil
-import re
+import ast
 
-# Read the original bot.py
+# Read and parse the original bot.py once; insertion points come from the
+# syntax tree instead of substring searches so formatting changes can't break them
 with open('bot.py', 'r') as f:
     content = f.read()
+tree = ast.parse(content)
+lines = content.splitlines(keepends=True)
+
+def is_logging_import(node):
+    return isinstance(node, ast.Import) and any(alias.name == 'logging' for alias in node.names)
+
+def is_client_assignment(node):
+    return (
+        isinstance(node, ast.Assign)
+        and any(isinstance(t, ast.Name) and t.id == 'app' for t in node.targets)
+        and isinstance(node.value, ast.Call)
+        and getattr(node.value.func, 'id', None) == 'Client'
+    )
+
+logging_import = next((node for node in tree.body if is_logging_import(node)), None)
+client_assignment = next((node for node in tree.body if is_client_assignment(node)), None)
+if logging_import is None or client_assignment is None:
+    raise SystemExit("❌ Could not find 'import logging' and 'app = Client(...)' in bot.py")
 
 # Add imports at the top
 imports_addition = """from pyrogram.errors import PeerIdInvalid, ChannelInvalid
 from pyrogram.raw.types import UpdateChannelMessageViews, UpdateChannel
 """
 
-# Insert after the existing imports
-import_pos = content.find('import logging\n') + len('import logging\n')
-content = content[:import_pos] + imports_addition + content[import_pos:]
-
 # Add update filter before the client creation
 update_filter = '''
 # Filter out problematic updates
@@ -39,22 +53,22 @@ def update_filter(update, users, chats):
                 # Convert to Telegram chat ID format
                 chat_id = -1000000000000 - channel_id
                 if chat_id != GROUP_ID:
-                    logger.debug(f"Ignoring {type(update).__name__} from chat {chat_id}")
+                    logger.debug("Ignoring %s from chat %s", type(update).__name__, chat_id)
                     return False
     
     return True
 
 '''
 
-# Insert before app creation
-app_pos = content.find('# Initialize Pyrogram client')
-content = content[:app_pos] + update_filter + content[app_pos:]
+# Insert before app creation, keeping any comment block directly above it attached
+app_line = client_assignment.lineno - 1
+while app_line > 0 and lines[app_line - 1].lstrip().startswith('#'):
+    app_line -= 1
 
-# Modify app creation to use the filter
-content = content.replace(
-    'app = Client(\n    "deletion_detector",\n    api_id=API_ID,\n    api_hash=API_HASH,\n    workdir=session_path\n)',
-    'app = Client(\n    "deletion_detector",\n    api_id=API_ID,\n    api_hash=API_HASH,\n    workdir=session_path\n)'
-)
+# Splice from the bottom up so the earlier line number stays valid
+lines.insert(app_line, update_filter)
+lines.insert(logging_import.end_lineno, imports_addition)
+content = ''.join(lines)
 
 # Write the fixed version
 with open('bot_fixed.py', 'w') as f:
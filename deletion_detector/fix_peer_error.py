@@ -17,6 +17,7 @@ logger = logging.getLogger(__name__)
 API_ID = os.getenv("TELEGRAM_API_ID")
 API_HASH = os.getenv("TELEGRAM_API_HASH")
 GROUP_ID = int(os.getenv("TELEGRAM_GROUP_ID", "0"))
+RESOLVE_CONCURRENCY = 8
 
 app = Client(
     "deletion_detector",
@@ -33,15 +34,22 @@ async def fix_peers():
     resolved = []
     failed = []
     
-    async for dialog in app.get_dialogs():
-        try:
-            # Force resolve the peer
-            await app.resolve_peer(dialog.chat.id)
-            resolved.append((dialog.chat.id, dialog.chat.title))
-            logger.info(f"✓ Resolved: {dialog.chat.title} ({dialog.chat.id})")
-        except Exception as e:
-            failed.append((dialog.chat.id, str(e)))
-            logger.error(f"✗ Failed: {dialog.chat.id} - {e}")
+    # Resolve peers concurrently, bounded so we don't trip flood limits
+    semaphore = asyncio.Semaphore(RESOLVE_CONCURRENCY)
+    
+    async def resolve(dialog):
+        async with semaphore:
+            try:
+                # Force resolve the peer
+                await app.resolve_peer(dialog.chat.id)
+                resolved.append((dialog.chat.id, dialog.chat.title))
+                logger.info(f"✓ Resolved: {dialog.chat.title} ({dialog.chat.id})")
+            except Exception as e:
+                failed.append((dialog.chat.id, str(e)))
+                logger.error(f"✗ Failed: {dialog.chat.id} - {e}")
+    
+    dialogs = [dialog async for dialog in app.get_dialogs()]
+    await asyncio.gather(*(resolve(dialog) for dialog in dialogs))
     
     print(f"\n✅ Successfully resolved {len(resolved)} peers")
     print(f"❌ Failed to resolve {len(failed)} peers")
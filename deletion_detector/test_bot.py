@@ -5,6 +5,7 @@ import os
 import sys
 import asyncio
 from pyrogram import Client
+from pyrogram.enums import ChatType
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -36,27 +37,49 @@ app = Client(
     workdir=session_path
 )
 
-async def test_connection():
-    """Test if we can connect to Telegram"""
+async def check_me():
+    """Check that the session is authorized"""
+    me = await app.get_me()
+    print(f"Successfully connected as: {me.first_name} ({me.username or 'no username'})")
+    print(f"User ID: {me.id}")
+
+async def check_dialogs():
+    """List the groups this account is in and flag the relay group"""
+    print("\nYour chats:")
+    async for dialog in app.get_dialogs():
+        if dialog.chat.type in (ChatType.GROUP, ChatType.SUPERGROUP):
+            print(f"- {dialog.chat.title} (ID: {dialog.chat.id})")
+            if dialog.chat.id == GROUP_ID:
+                print("  ✅ THIS IS YOUR RELAY GROUP!")
+
+async def check_group():
+    """Check that the monitored group is accessible"""
+    print(f"\nTrying to access group {GROUP_ID}...")
+    try:
+        chat = await app.get_chat(GROUP_ID)
+        print(f"✅ Success! Group name: {chat.title}")
+        print(f"   Type: {chat.type}")
+        print(f"   Members count: {chat.members_count}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print("\nPossible issues:")
+        print("1. You're not a member of this group")
+        print("2. The group ID might be incorrect")
+        print("3. You need to join the group with your account")
+
+async def test_connection(checks=(check_me, check_group)):
+    """Start the client once and run each check against the same connection"""
     try:
         await app.start()
-        me = await app.get_me()
-        print(f"Successfully connected as: {me.first_name} ({me.username or 'no username'})")
-        print(f"User ID: {me.id}")
-        
-        # Get chat info
         try:
-            chat = await app.get_chat(GROUP_ID)
-            print(f"Connected to chat: {chat.title}")
-            print(f"Chat type: {chat.type}")
-        except Exception as e:
-            print(f"Error getting chat info: {e}")
-        
-        await app.stop()
+            for check in checks:
+                await check()
+        finally:
+            await app.stop()
     except Exception as e:
         print(f"Error connecting: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
-    asyncio.run(test_connection())
\ No newline at end of file
+    asyncio.run(test_connection())
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import os
 import asyncio
-from pyrogram import Client, filters
+from pyrogram import Client, filters, idle
 from pyrogram.types import Message
 from dotenv import load_dotenv
 import logging
@@ -64,7 +64,9 @@ async def main():
     logger.info(f"Total handlers: {total}")
     
     logger.info("Waiting for messages...")
-    await asyncio.Event().wait()
+    # idle() returns on SIGINT/SIGTERM so the client can be stopped cleanly
+    await idle()
+    await app.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
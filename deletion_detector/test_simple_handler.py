@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import os
 import asyncio
-from pyrogram import Client, filters
+from pyrogram import Client, filters, idle
 from pyrogram.types import Message
 from pyrogram.handlers import MessageHandler
 from dotenv import load_dotenv
@@ -63,8 +63,8 @@ async def main():
     
     logger.info("Waiting for messages...")
     try:
-        await asyncio.Event().wait()
-    except KeyboardInterrupt:
+        # idle() returns on SIGINT/SIGTERM so the client can be stopped cleanly
+        await idle()
         logger.info("Stopping...")
     finally:
         await app.stop()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Shared Pyrogram client for the topic helper scripts
+"""
+
+import asyncio
+import os
+from pyrogram import Client, raw
+from pyrogram.errors import RPCError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Reuse the deletion detector's already-authorized session, resolved from this
+# file rather than the cwd so the scripts can be run from anywhere
+SESSION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "deletion_detector", "sessions")
+SESSION_NAME = "deletion_detector"
+
+def install_uvloop():
+    """Use uvloop when available; call before the client grabs a loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+def make_client():
+    """Create a client on the deletion detector's session (no login needed)"""
+    return Client(
+        SESSION_NAME,
+        api_id=os.getenv("TELEGRAM_API_ID"),
+        api_hash=os.getenv("TELEGRAM_API_HASH"),
+        workdir=SESSION_DIR
+    )
+
+async def fetch_forum_topics(app, chat_id):
+    """Return {topic_id: title} for a forum group, or None if it isn't one.
+
+    One channels.GetForumTopics call returns up to 100 topics, so this is a
+    handful of requests at most instead of paging through chat history.
+    """
+    try:
+        peer = await app.resolve_peer(chat_id)
+        topics = {}
+        offset_date = offset_id = offset_topic = 0
+        while True:
+            result = await app.invoke(
+                raw.functions.channels.GetForumTopics(
+                    channel=peer,
+                    offset_date=offset_date,
+                    offset_id=offset_id,
+                    offset_topic=offset_topic,
+                    limit=100
+                )
+            )
+            page = [t for t in result.topics if isinstance(t, raw.types.ForumTopic)]
+            new_ids = {topic.id for topic in page} - topics.keys()
+            for topic in page:
+                topics[topic.id] = topic.title
+            # Stop on a short page, or on a page with nothing new so a
+            # repeated page can't loop forever
+            if len(result.topics) < 100 or not new_ids:
+                return topics
+            # The next page starts after the last topic's top message, so
+            # both offsets come from that message (not the topic itself)
+            last = page[-1]
+            top_message = next(
+                (m for m in result.messages if getattr(m, "id", None) == last.top_message),
+                None
+            )
+            if top_message is None:
+                return topics
+            offset_date, offset_id, offset_topic = top_message.date, last.top_message, last.id
+    except RPCError:
+        return None
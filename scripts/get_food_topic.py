@@ -1,67 +1,84 @@
 #!/usr/bin/env python3
-import asyncio
 import os
-import sys
-from pyrogram import Client
+import re
 from dotenv import load_dotenv
+from _tg_client import fetch_forum_topics, make_client
 
 load_dotenv()
 
-async def get_food_topic():
+FOOD_KEYWORDS = ('food', 'recipe', 'cooking', 'meal', 'eat', 'restaurant', 'kitchen')
+# One alternation scans each message once instead of once per keyword. The
+# leading \b keeps "eat" out of words like "great" while still matching
+# "foods"/"eating"
+FOOD_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, FOOD_KEYWORDS)) + ")", re.IGNORECASE)
+# Stop reading history once this many messages in a row add no new topic
+STALE_LIMIT = 200
+
+async def get_food_topic(app):
     """Get the food topic ID from Telegram"""
     
-    api_id = os.getenv("TELEGRAM_API_ID")
-    api_hash = os.getenv("TELEGRAM_API_HASH")
     group_id = int(os.getenv("TELEGRAM_GROUP_ID"))
     
-    # Create a temporary client with unique session name
-    app = Client(
-        "topic_finder",
-        api_id=api_id,
-        api_hash=api_hash,
-        workdir="/tmp"  # Use temp directory to avoid conflicts
-    )
-    
     try:
         async with app:
             print("🔍 Searching for food topic ID...\n")
             
-            # Get recent messages to find topics
             topic_info = {}
-            seen_topics = set()
             
-            async for message in app.get_chat_history(group_id, limit=2000):
-                if hasattr(message, 'message_thread_id') and message.message_thread_id:
-                    thread_id = message.message_thread_id
-                    if thread_id not in seen_topics:
-                        seen_topics.add(thread_id)
-                        
-                        # Check message content for food-related keywords
-                        content = (message.text or message.caption or "").lower()
-                        
-                        # Look for food-related content
-                        food_keywords = ['food', 'recipe', 'cooking', 'meal', 'eat', 'restaurant', 'kitchen']
-                        is_food_related = any(keyword in content for keyword in food_keywords)
-                        
-                        # Store topic info
-                        topic_info[thread_id] = {
-                            'sample_content': content[:100] if content else '[No text]',
-                            'from_user': message.from_user.username if message.from_user else 'Unknown',
-                            'date': message.date,
-                            'is_food_related': is_food_related
-                        }
+            # Forum groups list their topics in one call; titles are the best sample
+            topics = await fetch_forum_topics(app, group_id)
+            if topics is not None:
+                for thread_id, title in topics.items():
+                    topic_info[thread_id] = {
+                        'sample_content': f"[Topic title] {title}",
+                        'from_user': 'n/a',
+                        'date': 'n/a',
+                        'is_food_related': FOOD_RE.search(title) is not None
+                    }
+            else:
+                # Otherwise get recent messages to find topics
+                seen_topics = set()
+                stale = 0
+                
+                async for message in app.get_chat_history(group_id, limit=2000):
+                    stale += 1
+                    if stale > STALE_LIMIT:
+                        break
+                    if message.message_thread_id:
+                        thread_id = message.message_thread_id
+                        if thread_id not in seen_topics:
+                            seen_topics.add(thread_id)
+                            stale = 0
+                            
+                            # Check message content for food-related keywords
+                            # (case-insensitive regex, so no lowercased copy of the text)
+                            content = message.text or message.caption or ""
+                            
+                            # Look for food-related content
+                            is_food_related = FOOD_RE.search(content) is not None
+                            
+                            # Store topic info
+                            topic_info[thread_id] = {
+                                'sample_content': content[:100] if content else '[No text]',
+                                'from_user': message.from_user.username if message.from_user else 'Unknown',
+                                'date': message.date,
+                                'is_food_related': is_food_related
+                            }
             
             if topic_info:
                 print("✅ Found Topics:")
                 print("================")
                 
                 # Show all topics, highlighting food-related ones
+                # Build the listing first and write it in one go
+                lines = []
                 for thread_id, info in sorted(topic_info.items()):
                     marker = "🍕 [FOOD-RELATED]" if info['is_food_related'] else ""
-                    print(f"\nTopic ID: {thread_id} {marker}")
-                    print(f"  Sample content: {info['sample_content']}")
-                    print(f"  From: {info['from_user']}")
-                    print(f"  Date: {info['date']}")
+                    lines.append(f"\nTopic ID: {thread_id} {marker}")
+                    lines.append(f"  Sample content: {info['sample_content']}")
+                    lines.append(f"  From: {info['from_user']}")
+                    lines.append(f"  Date: {info['date']}")
+                print("\n".join(lines))
                 
                 # Find most likely food topic
                 food_candidates = [tid for tid, info in topic_info.items() if info['is_food_related']]
@@ -84,14 +101,8 @@ async def get_food_topic():
     except Exception as e:
         print(f"❌ Error: {e}")
         print("This might be due to authentication or permission issues.")
-    
-    finally:
-        # Clean up temp session file
-        try:
-            import os as file_os
-            file_os.remove("/tmp/topic_finder.session")
-        except:
-            pass
 
 if __name__ == "__main__":
-    asyncio.run(get_food_topic())
\ No newline at end of file
+    # Reuses the deletion detector session, so no login handshake
+    app = make_client()
+    app.run(get_food_topic(app))
\ No newline at end of file
@@ -1,27 +1,22 @@
 #!/usr/bin/env python3
-import asyncio
 import os
-import sys
-from pyrogram import Client
+from typing import NamedTuple
 from dotenv import load_dotenv
+from _tg_client import make_client
 
 load_dotenv()
 
-async def get_food_topic_interactive():
+class TopicMessage(NamedTuple):
+    thread_id: int
+    content: str
+    username: str
+    date: object
+
+async def get_food_topic_interactive(app):
     """Interactive script to identify food topic ID"""
     
-    api_id = os.getenv("TELEGRAM_API_ID")
-    api_hash = os.getenv("TELEGRAM_API_HASH")
     group_id = int(os.getenv("TELEGRAM_GROUP_ID"))
     
-    # Create a temporary client
-    app = Client(
-        "topic_finder_interactive",
-        api_id=api_id,
-        api_hash=api_hash,
-        workdir="/tmp"
-    )
-    
     try:
         await app.start()
         print("🔍 Connected to Telegram!")
@@ -43,29 +38,30 @@ async def get_food_topic_interactive():
         messages_with_topics = []
         
         async for message in app.get_chat_history(group_id, limit=50):
-            if hasattr(message, 'message_thread_id') and message.message_thread_id:
-                thread_id = message.message_thread_id
+            if message.message_thread_id:
                 content = message.text or message.caption or '[Media/Sticker]'
                 username = message.from_user.username if message.from_user else 'Unknown'
                 
-                messages_with_topics.append({
-                    'thread_id': thread_id,
-                    'content': content[:100],
-                    'username': username,
-                    'date': message.date
-                })
+                messages_with_topics.append(TopicMessage(
+                    message.message_thread_id,
+                    content[:100],
+                    username,
+                    message.date
+                ))
         
         if messages_with_topics:
             print("\n📝 Recent messages with topic IDs:")
             print("=" * 80)
             
             # Show last 10 messages
+            lines = []
             for i, msg in enumerate(messages_with_topics[:10]):
-                print(f"\n{i+1}. Topic ID: {msg['thread_id']}")
-                print(f"   From: @{msg['username']}")
-                print(f"   Content: {msg['content']}")
-                print(f"   Time: {msg['date']}")
-                print("-" * 40)
+                lines.append(f"\n{i+1}. Topic ID: {msg.thread_id}")
+                lines.append(f"   From: @{msg.username}")
+                lines.append(f"   Content: {msg.content}")
+                lines.append(f"   Time: {msg.date}")
+                lines.append("-" * 40)
+            print("\n".join(lines))
             
             print(f"\n🍕 Which topic ID corresponds to your message in the food room?")
             food_topic_id = input("Enter the topic ID: ").strip()
@@ -88,15 +84,15 @@ async def get_food_topic_interactive():
     
     finally:
         await app.stop()
-        # Clean up temp session
-        try:
-            os.remove("/tmp/topic_finder_interactive.session")
-        except:
-            pass
 
-if __name__ == "__main__":
-    result = asyncio.run(get_food_topic_interactive())
+async def main(app):
+    result = await get_food_topic_interactive(app)
     if result:
         print(f"\n🎉 Success! Food topic ID: {result}")
     else:
-        print("\n❌ Failed to get topic ID")
\ No newline at end of file
+        print("\n❌ Failed to get topic ID")
+
+if __name__ == "__main__":
+    # Reuses the deletion detector session, so no login handshake
+    app = make_client()
+    app.run(main(app))
\ No newline at end of file
@@ -2,23 +2,83 @@
 import asyncio
 import os
 import sys
-from pyrogram import Client
 from pyrogram.types import Chat
 from dotenv import load_dotenv
+from _tg_client import fetch_forum_topics, make_client
 
 # Add parent directory to path to import from deletion_detector
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'deletion_detector'))
 
 load_dotenv()
 
-async def get_topic_ids():
-    """Get all topic IDs from the Telegram group"""
+# Stop reading history once this many messages in a row add no new topic
+STALE_LIMIT = 200
+
+# Known channel names
+CHANNEL_NAMES = ('vent', 'test', 'dev', 'music', 'art', 'pets')
+
+# Current Discord ID for each channel, shown next to the matched topic
+DISCORD_IDS = {
+    'vent': '1401061935604174928',
+    'test': '1402671254896644167',
+    'dev': '1402671075816636546',
+    'music': '1402670920136527902',
+    'art': '1401392870929465384',
+    'pets': '1402671738562674741'
+}
+
+async def collect_topics(app, group_id):
+    """Return {thread_id: info} for the group's topics"""
+    topic_info = {}
     
-    # Use the existing deletion detector session
-    app = Client(
-        "deletion_detector",
-        workdir="../deletion_detector/sessions"
-    )
+    # Forum groups return every topic with its name in one request
+    topics = await fetch_forum_topics(app, group_id)
+    if topics is not None:
+        for thread_id, title in topics.items():
+            topic_info[thread_id] = {
+                'name': title,
+                'last_message': '[Not fetched]',
+                'from': 'n/a'
+            }
+    else:
+        # Otherwise get recent messages to find different topics
+        seen_topics = set()
+        stale = 0
+        
+        async for message in app.get_chat_history(group_id, limit=1000):
+            stale += 1
+            if stale > STALE_LIMIT:
+                break
+            if message.message_thread_id:
+                thread_id = message.message_thread_id
+                if thread_id not in seen_topics:
+                    seen_topics.add(thread_id)
+                    stale = 0
+                    
+                    # Try to find topic name
+                    topic_name = "Unknown"
+                    
+                    # Check if this is a topic creation message
+                    if hasattr(message, 'forum_topic_created') and message.forum_topic_created:
+                        topic_name = message.forum_topic_created.name
+                    
+                    # Store topic info
+                    if thread_id not in topic_info:
+                        topic_info[thread_id] = {
+                            'name': topic_name,
+                            # Only the first 50 characters are ever shown, so don't keep the rest
+                            'last_message': message.text[:50] if message.text else '[No text]',
+                            'from': message.from_user.username if message.from_user else 'Unknown'
+                        }
+                    
+                    # Update name if we found it
+                    if topic_name != "Unknown":
+                        topic_info[thread_id]['name'] = topic_name
+    
+    return topic_info
+
+async def get_topic_ids(app):
+    """Get all topic IDs from the Telegram group"""
     
     async with app:
         print("🔍 Getting Telegram Topic IDs using Pyrogram...\n")
@@ -26,8 +86,16 @@ async def get_topic_ids():
         group_id = int(os.getenv('TELEGRAM_GROUP_ID'))
         
         try:
-            # Get the chat
-            chat = await app.get_chat(group_id)
+            # Try to get forum topics
+            print("🔍 Attempting to get forum topics...\n")
+            
+            # Chat info and topic discovery are independent, so fetch them
+            # concurrently and overlap the get_chat round trip with the topics
+            chat, topic_info = await asyncio.gather(
+                app.get_chat(group_id),
+                collect_topics(app, group_id)
+            )
+            
             print(f"📊 Chat Information:")
             print(f"- Title: {chat.title}")
             print(f"- Type: {chat.type}")
@@ -35,83 +103,46 @@ async def get_topic_ids():
             print(f"- Members: {chat.members_count}")
             print(f"- Is Forum: {'Yes' if hasattr(chat, 'is_forum') and chat.is_forum else 'Unknown'}\n")
             
-            # Try to get forum topics
-            print("🔍 Attempting to get forum topics...\n")
-            
-            # Get recent messages to find different topics
-            topic_info = {}
-            seen_topics = set()
-            
-            async for message in app.get_chat_history(group_id, limit=1000):
-                if hasattr(message, 'message_thread_id') and message.message_thread_id:
-                    thread_id = message.message_thread_id
-                    if thread_id not in seen_topics:
-                        seen_topics.add(thread_id)
-                        
-                        # Try to find topic name
-                        topic_name = "Unknown"
-                        
-                        # Check if this is a topic creation message
-                        if hasattr(message, 'forum_topic_created') and message.forum_topic_created:
-                            topic_name = message.forum_topic_created.name
-                        
-                        # Store topic info
-                        if thread_id not in topic_info:
-                            topic_info[thread_id] = {
-                                'name': topic_name,
-                                'last_message': message.text or '[Media]' if message.text else '[No text]',
-                                'from': message.from_user.username if message.from_user else 'Unknown'
-                            }
-                        
-                        # Update name if we found it
-                        if topic_name != "Unknown":
-                            topic_info[thread_id]['name'] = topic_name
-            
             if topic_info:
                 print("✅ Found Topics:")
                 print("================")
+                # Build the listing first and write it in one go
+                lines = []
                 for thread_id, info in sorted(topic_info.items()):
-                    print(f"\nTopic ID: {thread_id}")
-                    print(f"  Name: {info['name']}")
-                    print(f"  Last message: {info['last_message'][:50]}...")
-                    print(f"  From: {info['from']}")
+                    lines.append(f"\nTopic ID: {thread_id}")
+                    lines.append(f"  Name: {info['name']}")
+                    lines.append(f"  Last message: {info['last_message']}...")
+                    lines.append(f"  From: {info['from']}")
+                print("\n".join(lines))
                 
                 # Generate config
                 print("\n\n🔧 Update your config with these IDs:")
                 print("=====================================")
                 print("export const channelMappings: ChannelMappings = {")
                 
-                # Known channel names
-                channel_names = ['vent', 'test', 'dev', 'music', 'art', 'pets']
+                # Lowercase each topic name once; exact names win over substrings
+                lowered = [(info['name'].lower(), thread_id) for thread_id, info in topic_info.items()]
+                exact = {}
+                for name, thread_id in lowered:
+                    exact.setdefault(name, thread_id)
                 
-                for channel_name in channel_names:
+                for channel_name in CHANNEL_NAMES:
                     # Try to match topic by name
-                    matched_id = 'null'
-                    for thread_id, info in topic_info.items():
-                        if info['name'].lower() == channel_name or channel_name in info['name'].lower():
-                            matched_id = f"'{thread_id}'"
-                            break
-                    
-                    # Show current Discord ID from your list
-                    discord_ids = {
-                        'vent': '1401061935604174928',
-                        'test': '1402671254896644167',
-                        'dev': '1402671075816636546',
-                        'music': '1402670920136527902',
-                        'art': '1401392870929465384',
-                        'pets': '1402671738562674741'
-                    }
+                    thread_id = exact.get(channel_name)
+                    if thread_id is None:
+                        thread_id = next((tid for name, tid in lowered if channel_name in name), None)
+                    matched_id = f"'{thread_id}'" if thread_id is not None else 'null'
                     
                     print(f"  '{channel_name}': {{")
-                    print(f"    discord: '{discord_ids.get(channel_name, 'UNKNOWN')}',")
+                    print(f"    discord: '{DISCORD_IDS.get(channel_name, 'UNKNOWN')}',")
                     print(f"    telegram: {matched_id}")
                     print(f"  }},")
                 
                 print("};\n")
                 
                 # If some topics weren't matched
-                unmatched = [name for name in channel_names if not any(
-                    name in info['name'].lower() for info in topic_info.values()
+                unmatched = [channel_name for channel_name in CHANNEL_NAMES if not any(
+                    channel_name in name for name, _ in lowered
                 )]
                 
                 if unmatched:
@@ -133,4 +164,6 @@ async def get_topic_ids():
             print("3. The group ID is correct")
 
 if __name__ == "__main__":
-    asyncio.run(get_topic_ids())
\ No newline at end of file
+    # Use the existing deletion detector session
+    app = make_client()
+    app.run(get_topic_ids(app))
\ No newline at end of file
@@ -4,13 +4,12 @@ Simple topic monitor - shows recent messages with topic IDs
 Just send a message in the food room and I'll show you the topic ID
 """
 
-import asyncio
 import os
-import sys
 from datetime import datetime
-from pyrogram import Client, filters
+from pyrogram import Client, filters, idle
 from pyrogram.types import Message
 from dotenv import load_dotenv
+from _tg_client import install_uvloop, make_client
 
 load_dotenv()
 
@@ -23,26 +22,33 @@ print("2. Send a message like 'test food topic'")
 print("3. The topic ID will appear below")
 print("="*50)
 
+install_uvloop()
+
 # Use existing session from deletion detector
-app = Client(
-    "deletion_detector",
-    workdir="../deletion_detector/sessions"
-)
+app = make_client()
+
+# Coroutine filter: Pyrogram awaits it inline, whereas a plain function
+# filter is run in the client's thread pool for every update
+async def has_topic(_, __, message: Message):
+    return bool(message.message_thread_id)
 
-@app.on_message(filters.chat(group_id))
+in_topic = filters.create(has_topic)
+
+# Chat check runs first, so other chats never reach the topic filter, and
+# non-topic messages never reach the handler
+@app.on_message(filters.chat(group_id) & in_topic)
 async def show_message_info(client: Client, message: Message):
     """Show info about incoming messages"""
-    if hasattr(message, 'message_thread_id') and message.message_thread_id:
-        thread_id = message.message_thread_id
-        content = (message.text or message.caption or '[Media]')[:100]
-        username = message.from_user.username if message.from_user else 'Unknown'
-        
-        print(f"\n🆕 NEW MESSAGE:")
-        print(f"   Topic ID: {thread_id}")
-        print(f"   From: @{username}")
-        print(f"   Content: {content}")
-        print(f"   Time: {datetime.now().strftime('%H:%M:%S')}")
-        print("-" * 40)
+    thread_id = message.message_thread_id
+    content = (message.text or message.caption or '[Media]')[:100]
+    username = message.from_user.username if message.from_user else 'Unknown'
+    
+    print(f"\n🆕 NEW MESSAGE:")
+    print(f"   Topic ID: {thread_id}")
+    print(f"   From: @{username}")
+    print(f"   Content: {content}")
+    print(f"   Time: {datetime.now().strftime('%H:%M:%S')}")
+    print("-" * 40)
 
 async def main():
     print("\n⏳ Connecting...")
@@ -50,12 +56,12 @@ async def main():
         print("✅ Connected! Waiting for messages...")
         print("(Press Ctrl+C to stop)")
         
-        # Keep running
-        await asyncio.Event().wait()
+        # Keep running until Ctrl+C / SIGTERM
+        await idle()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        app.run(main())
     except KeyboardInterrupt:
         print("\n👋 Stopped monitoring")
     except Exception as e:
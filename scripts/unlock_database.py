@@ -4,6 +4,7 @@ Database unlock utility for Telegram Deletion Detector
 Manually unlocks database when it gets stuck
 """
 
+import glob
 import os
 import sys
 import subprocess
@@ -40,27 +41,36 @@ def unlock_database():
         logger.warning(f"⚠️  Could not kill deletion detector processes: {e}")
     
     # Step 3: Remove session files
-    session_files = [
-        "deletion_detector/deletion_bot.session",
-        "deletion_detector/deletion_bot.session-journal", 
-        "deletion_detector/deletion_bot.session-wal",
-        "deletion_detector/deletion_bot.session-shm",
+    # One directory pass per location; unlink without a prior exists() check
+    session_names = {
+        "deletion_bot.session",
+        "deletion_bot.session-journal",
+        "deletion_bot.session-wal",
+        "deletion_bot.session-shm"
+    }
+    session_dirs = [
+        "deletion_detector",
         # Also check common paths
-        "../deletion_detector/deletion_bot.session",
-        "../deletion_detector/deletion_bot.session-journal",
-        "../deletion_detector/deletion_bot.session-wal", 
-        "../deletion_detector/deletion_bot.session-shm"
+        "../deletion_detector"
     ]
     
     removed_files = 0
-    for session_file in session_files:
-        if os.path.exists(session_file):
-            try:
-                os.remove(session_file)
-                logger.info(f"✅ Removed session file: {session_file}")
-                removed_files += 1
-            except Exception as e:
-                logger.error(f"❌ Could not remove {session_file}: {e}")
+    for session_dir in session_dirs:
+        try:
+            with os.scandir(session_dir) as entries:
+                for entry in entries:
+                    if entry.name not in session_names:
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        logger.info(f"✅ Removed session file: {entry.path}")
+                        removed_files += 1
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        logger.error(f"❌ Could not remove {entry.path}: {e}")
+        except FileNotFoundError:
+            pass
     
     if removed_files == 0:
         logger.info("ℹ️  No session files found to remove")
@@ -71,16 +81,18 @@ def unlock_database():
         "/tmp/telegram-*"
     ]
     
+    # Expand and unlink in-process rather than spawning a shell + rm per pattern
     for pattern in temp_patterns:
-        try:
-            result = subprocess.run(f"rm -f {pattern}", shell=True, check=False, capture_output=True)
-            logger.info(f"🧹 Cleaned temp files matching: {pattern}")
-        except Exception as e:
-            logger.warning(f"⚠️  Could not clean temp files {pattern}: {e}")
+        for temp_file in glob.iglob(pattern):
+            try:
+                os.unlink(temp_file)
+            except OSError as e:
+                logger.warning(f"⚠️  Could not remove temp file {temp_file}: {e}")
+        logger.info(f"🧹 Cleaned temp files matching: {pattern}")
     
     # Step 5: Force garbage collection equivalent (sync filesystem)
     try:
-        subprocess.run(["sync"], check=False)
+        os.sync()
         logger.info("🔄 Synced filesystem")
     except:
         pass
@@ -60,37 +60,55 @@ router.post('/deletion-webhook', async (req, res): Promise<void> => {
   logger.info(`Request body:`, JSON.stringify(req.body));
   logger.info(`Headers:`, req.headers);
   
-  const { telegram_msg_id, mapping_id } = req.body;
+  // Accept either a batch ({ deletions: [...] }) or a single deletion
+  const deletions: any[] = Array.isArray(req.body?.deletions) ? req.body.deletions : [req.body];
   
-  logger.info(`Deletion webhook processing: Telegram msg ${telegram_msg_id}, mapping ${mapping_id}`);
+  logger.info(`Deletion webhook processing ${deletions.length} deletion(s)`);
+  
+  // Track what has already gone out so a Redis failure partway through can
+  // tell the detector which deletions not to resend
+  const published: number[] = [];
   
   try {
-    if (!mapping_id) {
+    if (deletions.length === 0 || deletions.some(d => !d?.mapping_id)) {
       logger.error('No mapping_id provided in deletion webhook');
       res.status(400).json({ success: false, error: 'mapping_id required' });
       return;
     }
     
-    // Publish deletion event via Redis pub/sub
-    const deletionEvent: DeletionEvent = {
-      mappingId: mapping_id,
-      platform: Platform.Telegram,
-      messageId: telegram_msg_id,
-      timestamp: Date.now()
-    };
-    
-    await redisEvents.publishDeletion(deletionEvent);
-    logger.info(`Published deletion event for mapping ${mapping_id}`);
-    
-    // Async mark as deleted in database (don't await)
-    messageDb.markDeleted(telegram_msg_id).catch(err => 
-      logger.error('Failed to mark message as deleted in database:', err)
-    );
+    try {
+      for (const { telegram_msg_id, mapping_id } of deletions) {
+        logger.info(`Deletion webhook processing: Telegram msg ${telegram_msg_id}, mapping ${mapping_id}`);
+        
+        // Publish deletion event via Redis pub/sub
+        const deletionEvent: DeletionEvent = {
+          mappingId: mapping_id,
+          platform: Platform.Telegram,
+          messageId: telegram_msg_id,
+          timestamp: Date.now()
+        };
+        
+        await redisEvents.publishDeletion(deletionEvent);
+        logger.info(`Published deletion event for mapping ${mapping_id}`);
+        published.push(telegram_msg_id);
+      }
+    } finally {
+      // Async mark whatever was published as deleted in database (don't await)
+      if (published.length > 0) {
+        messageDb.markDeleted(published).catch(err => 
+          logger.error('Failed to mark message as deleted in database:', err)
+        );
+      }
+    }
     
-    res.status(200).json({ success: true });
+    res.status(200).json({ success: true, published });
   } catch (error) {
     logger.error('Error in deletion webhook:', error);
-    res.status(500).json({ success: false, error: error instanceof Error ? error.message : 'Internal server error' });
+    res.status(500).json({
+      success: false,
+      error: error instanceof Error ? error.message : 'Internal server error',
+      published
+    });
   }
 });
 
@@ -124,13 +124,17 @@ export class MessageDatabase {
     }
   }
 
-  async markDeleted(telegramMsgId: number): Promise<void> {
+  async markDeleted(telegramMsgIds: number | number[]): Promise<void> {
+    const ids = Array.isArray(telegramMsgIds) ? telegramMsgIds : [telegramMsgIds];
+    if (ids.length === 0) return;
+    
     try {
+      // One statement for the whole batch
       await this.db.run(`
         UPDATE message_tracking 
         SET is_deleted = TRUE, deleted_at = datetime('now')
-        WHERE telegram_msg_id = ?
-      `, [telegramMsgId]);
+        WHERE telegram_msg_id IN (${ids.map(() => '?').join(',')})
+      `, ids);
     } catch (error) {
       logger.error('Failed to mark message as deleted:', error);
     }
@@ -406,6 +410,11 @@ export class MessageDatabase {
     }
     
     if (this.db) {
+      // Refresh planner statistics so the (platform, message_id) and
+      // telegram_msg_id lookups keep choosing their indexes
+      await this.db.run('PRAGMA optimize').catch(err =>
+        logger.warn('PRAGMA optimize failed on close:', err)
+      );
       await this.db.close();
     }
   }
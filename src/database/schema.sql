@@ -26,7 +26,10 @@ CREATE TABLE IF NOT EXISTS platform_messages (
 );
 
 CREATE INDEX IF NOT EXISTS idx_platform_messages_mapping ON platform_messages(mapping_id);
-CREATE INDEX IF NOT EXISTS idx_platform_messages_lookup ON platform_messages(platform, message_id);
+-- Covers platform/message ID -> mapping_id lookups (the UNIQUE constraint
+-- already indexes the key itself)
+DROP INDEX IF EXISTS idx_platform_messages_lookup;
+CREATE INDEX IF NOT EXISTS idx_platform_messages_covering ON platform_messages(platform, message_id, mapping_id);
 
 -- Telegram-specific tracking for deletion detection
 CREATE TABLE IF NOT EXISTS message_tracking (
@@ -43,7 +46,10 @@ CREATE TABLE IF NOT EXISTS message_tracking (
   deleted_at DATETIME
 );
 
-CREATE INDEX IF NOT EXISTS idx_telegram_msg_id ON message_tracking(telegram_msg_id);
+-- telegram_msg_id is already indexed by its UNIQUE constraint; this covering
+-- index lets mapping lookups by message ID skip the table row entirely
+DROP INDEX IF EXISTS idx_telegram_msg_id;
+CREATE INDEX IF NOT EXISTS idx_tracking_lookup ON message_tracking(telegram_msg_id, mapping_id);
 CREATE INDEX IF NOT EXISTS idx_tracking_mapping_id ON message_tracking(mapping_id);
 CREATE INDEX IF NOT EXISTS idx_tracking_timestamp ON message_tracking(timestamp);
 CREATE INDEX IF NOT EXISTS idx_tracking_is_deleted ON message_tracking(is_deleted);
\ No newline at end of file
@@ -7,16 +7,23 @@ from datetime import datetime
 # Connect to database
 db_path = "./relay_messages.db"
 db = sqlite3.connect(db_path)
+# Same settings the relayer uses (src/database/db.ts) so this script waits
+# for the bot's writes instead of failing with "database is locked"
+db.execute("PRAGMA journal_mode=WAL")
+db.execute("PRAGMA busy_timeout=10000")
+db.execute("PRAGMA synchronous=NORMAL")
 cursor = db.cursor()
 
 print("🔍 Manual Deletion Test\n")
 
-# Find a recent Telegram message
+# Find a recent Telegram message. The unary + keeps SQLite off the low-selectivity
+# is_deleted index so it walks idx_tracking_timestamp newest-first and stops at
+# the first match instead of sorting every undeleted row
 cursor.execute("""
     SELECT telegram_msg_id, mapping_id, content 
     FROM message_tracking 
     WHERE platform = 'Telegram' 
-    AND is_deleted = 0
+    AND +is_deleted = 0
     AND mapping_id IS NOT NULL
     ORDER BY timestamp DESC 
     LIMIT 1
@@ -49,24 +56,22 @@ for platform, discord_id, twitch_id in platform_messages:
     elif platform == "Twitch" and twitch_id:
         print(f"   Twitch: {twitch_id}")
 
-# Simulate deletion by marking as deleted
+# Simulate deletion by marking as deleted and recording a dummy deletion
+# event, both in one transaction (one commit, one WAL flush)
 print(f"\n🗑️ Simulating deletion of Telegram message {msg_id}...")
-cursor.execute("""
-    UPDATE message_tracking 
-    SET is_deleted = 1, deleted_at = datetime('now')
-    WHERE telegram_msg_id = ?
-""", (msg_id,))
-db.commit()
+with db:
+    cursor.execute("""
+        UPDATE message_tracking 
+        SET is_deleted = 1, deleted_at = datetime('now')
+        WHERE telegram_msg_id = ?
+    """, (msg_id,))
+    cursor.execute("""
+        INSERT INTO deletion_events (telegram_msg_id, mapping_id, webhook_called, timestamp)
+        VALUES (?, ?, 0, datetime('now'))
+    """, (msg_id, mapping_id))
 
 print("✅ Message marked as deleted in database")
 
-# Create a dummy deletion event entry
-cursor.execute("""
-    INSERT INTO deletion_events (telegram_msg_id, mapping_id, webhook_called, timestamp)
-    VALUES (?, ?, 0, datetime('now'))
-""", (msg_id, mapping_id))
-db.commit()
-
 print("\n⚡ To complete the test:")
 print(f"1. Run: node test_deletion_simple.js {msg_id}")
 print("2. Or manually call the webhook with:")
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import asyncio
 import json
-from pyrogram import Client, filters
+from pyrogram import Client, filters, idle
 from pyrogram.types import Message
 import os
 from dotenv import load_dotenv
@@ -17,6 +17,13 @@ if not api_id or not api_hash:
     print("Missing TELEGRAM_API_ID or TELEGRAM_API_HASH in .env")
     exit(1)
 
+# Use uvloop when available; must be installed before the client grabs a loop
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Create client
 app = Client(
     "reply_test_bot",
@@ -102,10 +109,10 @@ async def main():
         print("\nPress Ctrl+C to stop.")
         
         # Keep the script running
-        await app.idle()
+        await idle()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        app.run(main())
     except KeyboardInterrupt:
         print("\nStopping bot...")
\ No newline at end of file